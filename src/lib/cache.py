@@ -0,0 +1,93 @@
+"""
+Persistent on-disk cache for API client responses
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import typing
+from typing import Any, Dict, Optional
+from pydantic import TypeAdapter
+
+DEFAULT_TTL = 60 * 60 # 1 hour
+
+def default_cache_dir() -> str:
+    """$XDG_CACHE_HOME/mcmodmanager/http, falling back to ~/.cache"""
+    base = os.getenv('XDG_CACHE_HOME') or os.path.join(os.getenv('HOME') or '~', '.cache')
+    return os.path.join(base, 'mcmodmanager', 'http')
+
+
+class CachedClient:
+    """
+    Read-aside caching proxy around a (synchronous) API client.
+
+    Every public method is wrapped: the result is keyed on the method name and its
+    arguments, serialized to JSON according to the method's return annotation and
+    stored under `cache_dir/<namespace>/<sha1(key)>.json`. Entries older than their
+    TTL are refetched, entries older than the longest TTL are pruned on construction.
+    Cache I/O errors are ignored, the client is then simply called.
+    """
+
+    def __init__(self, client: Any, namespace: str, ttl: Optional[Dict[str, int]] = None,
+                 default_ttl: int = DEFAULT_TTL, cache_dir: Optional[str] = None):
+        self.client = client
+        self.namespace = namespace
+        self.ttl = ttl or {}
+        self.default_ttl = default_ttl
+        self.cache_dir = os.path.join(cache_dir or default_cache_dir(), namespace)
+        self._adapters: Dict[str, TypeAdapter] = {}
+        self.prune(max([default_ttl, *self.ttl.values()]))
+
+    def prune(self, max_age: int):
+        """Remove entries (and leftover temporary files) older than max_age seconds"""
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except OSError:
+            return
+        now = time.time()
+        for entry in entries:
+            try:
+                if entry.name.endswith(('.json', '.tmp')) and now - entry.stat().st_mtime >= max_age:
+                    os.unlink(entry.path)
+            except OSError:
+                pass
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.client, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        if name not in self._adapters:
+            self._adapters[name] = TypeAdapter(typing.get_type_hints(attr).get('return', Any))
+        adapter = self._adapters[name]
+        ttl = self.ttl.get(name, self.default_ttl)
+
+        def cached(*args, **kwargs):
+            key = json.dumps([self.namespace, name, args, kwargs], sort_keys=True, default=str)
+            path = os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + '.json')
+            try:
+                if time.time() - os.path.getmtime(path) < ttl:
+                    with open(path, 'rb') as f:
+                        return adapter.validate_json(f.read())
+            except (OSError, ValueError):
+                pass
+
+            result = attr(*args, **kwargs)
+            tmp = None
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(adapter.dump_json(result))
+                os.replace(tmp, path)
+            except (OSError, ValueError):
+                if tmp is not None:
+                    try:
+                        os.unlink(tmp)
+                    except OSError:
+                        pass
+            return result
+
+        return cached
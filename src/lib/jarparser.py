@@ -2,15 +2,22 @@
 Mason version support
 Generated by Claude Sonnet 4.5
 """
-import json
+import io
 import zipfile
-import toml
-import tempfile
+import tomllib
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
+
+# orjson is optional, both accept the raw bytes read from the jar
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 class ModLoader(Enum):
     FORGE = "forge"
@@ -22,7 +29,7 @@ class ModLoader(Enum):
 
 
 # Special mod IDs that represent the game/loader itself
-SPECIAL_MODS = {
+SPECIAL_MODS = frozenset({
     'minecraft',
     'forge',
     'neoforge',
@@ -32,10 +39,29 @@ SPECIAL_MODS = {
     'cauldron',
     'java',
     'fml'  # Forge Mod Loader
-}
+})
+
+
+def _is_special(mod_id: str) -> bool:
+    """Check if mod_id is a special mod, trying it as-is first since ids are usually lowercase"""
+    return mod_id in SPECIAL_MODS or mod_id.lower() in SPECIAL_MODS
+
+
+# Common file name patterns, tried in order by _parse_from_filename
+_FILENAME_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'^(.+?)[-_](\d+(?:\.\d+)*(?:[-+].+?)?)$',  # modid-1.2.3 or modid_1.2.3
+    r'^(.+?)[-_]mc\d+\.\d+(?:\.\d+)?[-_](\d+(?:\.\d+)*(?:[-+].+?)?)$',  # modid-mc1.19.2-1.2.3
+    r'^(.+?)[-_](?:forge|fabric|quilt)[-_](\d+(?:\.\d+)*(?:[-+].+?)?)$',  # modid-forge-1.2.3
+))
+
+# Version at the end of a jar file name, fallback for ${file.jarVersion}
+_JAR_VERSION_RE = re.compile(r'[-_](\d+(?:\.\d+)*(?:[-+].+?)?)\.jar$')
+
+# Implementation-Version entry of a MANIFEST.MF
+_IMPL_VERSION_RE = re.compile(rb'^Implementation-Version:[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Dependency:
     mod_id: str
     version_range: str = "*"
@@ -44,7 +70,14 @@ class Dependency:
     is_special: bool = False  # For minecraft, forge, fabric, etc.
 
 
-@dataclass
+@lru_cache(maxsize=8192)
+def _intern_dep(mod_id: str, version_range: str = "*", mandatory: bool = True,
+                ordering: str = "NONE", is_special: bool = False) -> Dependency:
+    """Create a Dependency, sharing one instance between identical declarations"""
+    return Dependency(mod_id, version_range, mandatory, ordering, is_special)
+
+
+@dataclass(slots=True)
 class ModInfo:
     mod_id: str
     name: str
@@ -61,24 +94,17 @@ class ModParser:
     """Parse mod metadata from various mod loaders"""
     
     @staticmethod
-    def parse_mod_file(file_path: Path) -> List[ModInfo]:
+    def parse_mod_file(file_path: Path, data: Optional[bytes] = None) -> List[ModInfo]:
         """
         Parse a mod JAR file and extract metadata.
+        If data is given, the JAR is read from memory and file_path is only used for naming.
         Returns a list of ModInfo (main mod + any nested Jar-in-Jar mods)
         """
         mods = []
         
         try:
-            with zipfile.ZipFile(file_path, 'r') as jar:
-                # Parse main mod
-                main_mod = ModParser._parse_main_mod(jar, file_path)
-                if main_mod:
-                    mods.append(main_mod)
-                
-                # Extract and parse nested JARs if enabled
-                if main_mod:
-                    nested_mods = ModParser._extract_jar_in_jar(jar, file_path, main_mod)
-                    mods.extend(nested_mods)
+            with zipfile.ZipFile(file_path if data is None else io.BytesIO(data), 'r') as jar:
+                mods = ModParser._parse_open_zip(jar, file_path)
             if mods:
                 return mods
                 
@@ -94,15 +120,39 @@ class ModParser:
 
         return mods
 
+    @staticmethod
+    def iter_parse(paths: List[Path], workers: int = 8) -> Iterator[Tuple[Path, List[ModInfo]]]:
+        """
+        Parse several mod JAR files concurrently.
+        Yields (path, ModInfo of the file) in the order of paths, as soon as each one is parsed
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from zip(paths, executor.map(ModParser.parse_mod_file, paths))
+
+    @staticmethod
+    def _parse_open_zip(jar: zipfile.ZipFile, display_path: Path) -> List[ModInfo]:
+        """Parse the main mod and nested JARs of an opened JAR file"""
+        mods = []
+        
+        # Parse main mod
+        names = set(jar.namelist())
+        main_mod = ModParser._parse_main_mod(jar, display_path, names)
+        if main_mod:
+            mods.append(main_mod)
+            
+            # Parse nested JARs
+            nested_mods = ModParser._extract_jar_in_jar(jar, display_path, main_mod, names)
+            mods.extend(nested_mods)
+        
+        return mods
+
     @staticmethod
     def _parse_manifest(jar: zipfile.ZipFile, file_path: Path) -> Optional[str]:
 
         try:
-            with jar.open('META-INF/MANIFEST.MF') as manifest_file:
-                for line in manifest_file:
-                    line = line.decode('utf-8').strip()
-                    if line.startswith('Implementation-Version:'):
-                        return line.split(':', 1)[1].strip()
+            match = _IMPL_VERSION_RE.search(jar.read('META-INF/MANIFEST.MF'))
+            if match:
+                return match.group(1).decode('utf-8')
             print(f"No Implementation-Version found in {file_path} MANIFEST.MF.")
             return None
         except KeyError:
@@ -118,14 +168,8 @@ class ModParser:
         name = file_path.stem  # Remove .jar
         
         # Try common patterns
-        patterns = [
-            r'^(.+?)[-_](\d+(?:\.\d+)*(?:[-+].+?)?)$',  # modid-1.2.3 or modid_1.2.3
-            r'^(.+?)[-_]mc\d+\.\d+(?:\.\d+)?[-_](\d+(?:\.\d+)*(?:[-+].+?)?)$',  # modid-mc1.19.2-1.2.3
-            r'^(.+?)[-_](?:forge|fabric|quilt)[-_](\d+(?:\.\d+)*(?:[-+].+?)?)$',  # modid-forge-1.2.3
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, name)
+        for pattern in _FILENAME_PATTERNS:
+            match = pattern.match(name)
             if match:
                 mod_id = match.group(1).lower().replace('-', '_').replace(' ', '_')
                 version = match.group(2)
@@ -149,20 +193,20 @@ class ModParser:
         )
     
     @staticmethod
-    def _parse_main_mod(jar: zipfile.ZipFile, file_path: Path) -> Optional[ModInfo]:
+    def _parse_main_mod(jar: zipfile.ZipFile, file_path: Path, names: Set[str]) -> Optional[ModInfo]:
         """Parse the main mod from a JAR file"""
         # Try Forge/NeoForge (mods.toml)
         result = None
-        if 'META-INF/mods.toml' in jar.namelist():
+        if 'META-INF/mods.toml' in names:
             result = ModParser._parse_forge_neoforge(jar, file_path)
         # Try Fabric/Quilt (fabric.mod.json)
-        elif 'fabric.mod.json' in jar.namelist():
+        elif 'fabric.mod.json' in names:
             result = ModParser._parse_fabric_quilt(jar, file_path)
         # Try old Forge (mcmod.info)
-        elif 'mcmod.info' in jar.namelist():
+        elif 'mcmod.info' in names:
             result = ModParser._parse_old_forge(jar, file_path)
         # Try LiteLoader (litemod.json)
-        elif 'litemod.json' in jar.namelist():
+        elif 'litemod.json' in names:
             result = ModParser._parse_liteloader(jar, file_path)
 
         if not result:
@@ -175,7 +219,7 @@ class ModParser:
         return result
     
     @staticmethod
-    def _extract_jar_in_jar(jar: zipfile.ZipFile, parent_path: Path, parent_mod: ModInfo) -> List[ModInfo]:
+    def _extract_jar_in_jar(jar: zipfile.ZipFile, parent_path: Path, parent_mod: ModInfo, names: Set[str]) -> List[ModInfo]:
         """
         Extract and parse nested JAR files (Jar-in-Jar).
         Common locations:
@@ -187,7 +231,7 @@ class ModParser:
         
         # Look for nested JARs in common locations
         nested_jar_paths = []
-        for name in jar.namelist():
+        for name in names:
             if name.endswith('.jar') and (
                 name.startswith('META-INF/jarjar/') or
                 '/jars/' in name
@@ -198,27 +242,20 @@ class ModParser:
         if not nested_jar_paths:
             return nested_mods
         
-        # Create temp directory for extraction
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            for nested_jar_path in nested_jar_paths:
-                try:
-                    # Extract nested JAR
-                    jar.extract(nested_jar_path, temp_path)
-                    extracted_path = temp_path / nested_jar_path
-                    
-                    # Parse the nested JAR
-                    nested_jar_mods = ModParser.parse_mod_file(extracted_path)
+        for nested_jar_path in sorted(nested_jar_paths):
+            try:
+                # Parse the nested JAR in memory
+                nested_jar_mods = ModParser.parse_mod_file(
+                    parent_path / nested_jar_path, jar.read(nested_jar_path))
+                
+                for nested_mod in nested_jar_mods:
+                    nested_mod.is_jar_in_jar = True
+                    nested_mod.parent_mod = parent_name
+                    nested_mod.file_path = parent_path  # Reference parent file
+                    nested_mods.append(nested_mod)
                     
-                    for nested_mod in nested_jar_mods:
-                        nested_mod.is_jar_in_jar = True
-                        nested_mod.parent_mod = parent_name
-                        nested_mod.file_path = parent_path  # Reference parent file
-                        nested_mods.append(nested_mod)
-                        
-                except Exception as e:
-                    print(f"Warning: Failed to parse nested JAR {nested_jar_path}: {e}")
+            except Exception as e:
+                print(f"Warning: Failed to parse nested JAR {nested_jar_path}: {e}")
         
         return nested_mods
 
@@ -233,17 +270,14 @@ class ModParser:
         # ${file.jarVersion} - extract from jar manifest
         if '${file.jarVersion}' in value:
             try:
-                manifest = jar.read('META-INF/MANIFEST.MF').decode('utf-8')
-                for line in manifest.split('\n'):
-                    if line.startswith('Implementation-Version:'):
-                        version = line.split(':', 1)[1].strip()
-                        value = value.replace('${file.jarVersion}', version)
-                        return value
+                match = _IMPL_VERSION_RE.search(jar.read('META-INF/MANIFEST.MF'))
+                if match:
+                    return value.replace('${file.jarVersion}', match.group(1).decode('utf-8'))
             except:
                 pass
             
             # Fallback: try to extract from filename
-            match = re.search(r'[-_](\d+(?:\.\d+)*(?:[-+].+?)?)\.jar$', file_path.name)
+            match = _JAR_VERSION_RE.search(file_path.name)
             if match:
                 value = value.replace('${file.jarVersion}', match.group(1))
         
@@ -253,7 +287,7 @@ class ModParser:
     def _parse_forge_neoforge(jar: zipfile.ZipFile, file_path: Path) -> Optional[ModInfo]:
         """Parse Forge/NeoForge mods.toml"""
         content = jar.read('META-INF/mods.toml').decode('utf-8')
-        data = toml.loads(content)
+        data = tomllib.loads(content)
         
         # Determine if it's NeoForge or Forge
         loader_str = data.get('loaderVersion', '')
@@ -273,12 +307,12 @@ class ModParser:
         dependencies = []
         for dep in data.get('dependencies', {}).get(mod_id, []):
             dep_mod_id = dep.get('modId', '')
-            dependencies.append(Dependency(
+            dependencies.append(_intern_dep(
                 mod_id=dep_mod_id,
                 version_range=dep.get('versionRange', '*'),
                 mandatory=dep.get('mandatory', True),
                 ordering=dep.get('ordering', 'NONE'),
-                is_special=dep_mod_id.lower() in SPECIAL_MODS,
+                is_special=_is_special(dep_mod_id),
             ))
         
         return ModInfo(
@@ -293,8 +327,7 @@ class ModParser:
     @staticmethod
     def _parse_fabric_quilt(jar: zipfile.ZipFile, file_path: Path) -> ModInfo:
         """Parse Fabric/Quilt fabric.mod.json"""
-        content = jar.read('fabric.mod.json').decode('utf-8')
-        data = json.loads(content)
+        data = _json_loads(jar.read('fabric.mod.json'))
         
         mod_id = data.get('id', 'unknown')
         name = data.get('name', mod_id)
@@ -307,11 +340,11 @@ class ModParser:
         # Parse dependencies
         dependencies = []
         for dep_id, dep_version in depends.items():
-            dependencies.append(Dependency(
+            dependencies.append(_intern_dep(
                 mod_id=dep_id,
                 version_range=dep_version if isinstance(dep_version, str) else '*',
                 mandatory=True,
-                is_special=dep_id.lower() in SPECIAL_MODS,
+                is_special=_is_special(dep_id),
             ))
         
         # Parse provides
@@ -330,8 +363,7 @@ class ModParser:
     @staticmethod
     def _parse_old_forge(jar: zipfile.ZipFile, file_path: Path) -> ModInfo:
         """Parse old Forge mcmod.info"""
-        content = jar.read('mcmod.info').decode('utf-8')
-        data = json.loads(content)
+        data = _json_loads(jar.read('mcmod.info'))
         
         if isinstance(data, list):
             data = data[0]
@@ -343,10 +375,10 @@ class ModParser:
         # Parse dependencies
         dependencies = []
         for dep in data.get('requiredMods', []):
-            dependencies.append(Dependency(
+            dependencies.append(_intern_dep(
                 mod_id=dep,
                 mandatory=True,
-                is_special=dep.lower() in SPECIAL_MODS,
+                is_special=_is_special(dep),
             ))
         
         return ModInfo(
@@ -361,8 +393,7 @@ class ModParser:
     @staticmethod
     def _parse_liteloader(jar: zipfile.ZipFile, file_path: Path) -> ModInfo:
         """Parse LiteLoader litemod.json"""
-        content = jar.read('litemod.json').decode('utf-8')
-        data = json.loads(content)
+        data = _json_loads(jar.read('litemod.json'))
         
         mod_id = data.get('name', 'unknown')
         name = data.get('displayName', mod_id)
@@ -371,10 +402,10 @@ class ModParser:
         # LiteLoader doesn't typically have complex dependency definitions
         dependencies = []
         for dep in data.get('requiredMods', []):
-            dependencies.append(Dependency(
+            dependencies.append(_intern_dep(
                 mod_id=dep,
                 mandatory=True,
-                is_special=dep.lower() in SPECIAL_MODS,
+                is_special=_is_special(dep),
             ))
         
         return ModInfo(
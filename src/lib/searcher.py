@@ -1,9 +1,40 @@
 from src.lib.downloader import FileMetadata
+import asyncio
+import httpx
 import curseforge_api_wrapper as cfapi
+import curseforge_api_wrapper.network as cfnet
 from curseforge_api_wrapper.client import SortOrder
 import modrinth_api_wrapper as mrapi
-from typing import List, Optional, Tuple
+import modrinth_api_wrapper.network as mrnet
+from typing import Callable, Dict, List, Optional, Tuple
 from src.lib.version import MavenVersion
+from src.lib.cache import CachedClient
+from functools import lru_cache
+
+DAY = 24 * 60 * 60
+modrinth_cache_ttl = { "get_versions": DAY }
+curseforge_cache_ttl = { "get_files": DAY, "get_file_download_url": DAY }
+
+@lru_cache(maxsize=4096)
+def _parse_maven(version: str) -> MavenVersion:
+    """Parsed version strings are shared across projects and searches"""
+    return MavenVersion(version)
+
+_EMPTY_HASHES: Dict[int, str] = {}
+
+def _cf_hashes(file: cfapi.File) -> Dict[int, str]:
+    """algo -> hash of a CurseForge file (1 = sha1, 2 = md5), do not mutate the result"""
+    return { h.algo:h.value for h in file.hashes } if file.hashes else _EMPTY_HASHES
+
+# version ids per bulk request, each id takes ~15 bytes of the query string
+VERSION_BATCH_SIZE = 100
+
+# same ids as CurseForge's releaseType, a file passes if its id <= the requested one
+release_type_lookup = {
+    "release": 1,
+    "beta": 2,
+    "alpha": 3,
+}
 
 mod_loader_lookup = {
     "forge": 1,
@@ -21,71 +52,160 @@ class ModSearcher:
     curseforge_api_key: Optional[str]
     mrcli: mrapi.Client = mrapi.Client()
     cfcli: Optional[cfapi.Client] = None
+    limiter: asyncio.Semaphore
+    session: Optional[httpx.Client] = None
+    # the searcher whose session is installed in the wrappers, see __init__
+    _session_owner: Optional['ModSearcher'] = None
+    # memoized per invocation, keyed on (mod id, release type)
+    _latest_version_cache: Dict[Tuple[str, int], Optional[mrapi.Version]]
+    _latest_file_cache: Dict[Tuple[int, int], asyncio.Task]
 
-    def __init__(self, mc_version: str, mod_loader: str, curseforge_api_key: Optional[str]):
+    def __init__(self, mc_version: str, mod_loader: str, curseforge_api_key: Optional[str], parallel: int = 5, use_cache: bool = True):
         self.mc_version = mc_version
         self.mod_loader = mod_loader.lower()
         self.curseforge_api_key = curseforge_api_key
+        self.limiter = asyncio.Semaphore(parallel)
+        # both wrappers send through a module level httpx client, share one keep-alive pool.
+        # the wrappers take no client argument, so only the first live searcher installs
+        # its pool, nested searchers send through it too
+        if ModSearcher._session_owner is None:
+            self.session = httpx.Client(limits=httpx.Limits(
+                max_connections=parallel,
+                max_keepalive_connections=parallel,
+                keepalive_expiry=30))
+            self._replaced_sessions = (mrnet.CLIENT, cfnet.CLIENT)
+            mrnet.CLIENT = cfnet.CLIENT = self.session
+            ModSearcher._session_owner = self
+        self._latest_version_cache = {}
+        self._latest_file_cache = {}
+        if use_cache:
+            self.mrcli = CachedClient(self.mrcli, "modrinth", modrinth_cache_ttl) # type: ignore
         if curseforge_api_key is not None:
             self.cfcli = cfapi.Client(curseforge_api_key)
+            if use_cache:
+                self.cfcli = CachedClient(self.cfcli, "curseforge", curseforge_cache_ttl) # type: ignore
             self.mod_loader_id = mod_loader_lookup.get(self.mod_loader, 0)
 
-    def get_latest_versions(self, mods: List[mrapi.Project], releaseType: str) -> List[Tuple[mrapi.Project, mrapi.Version]]:
+    def close(self):
+        """Close the shared connection pool and give the wrappers their own clients back"""
+        if ModSearcher._session_owner is not self:
+            return
+        mrnet.CLIENT, cfnet.CLIENT = self._replaced_sessions
+        ModSearcher._session_owner = None
+        # the owner always has a session
+        if self.session is not None:
+            self.session.close()
+
+    async def _call(self, func, *args, **kwargs):
+        """Run a blocking API call in a worker thread, capped by the concurrency limit"""
+        async with self.limiter:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def get_latest_versions(self, mods: List[mrapi.Project], releaseTypeId: int) -> List[Tuple[mrapi.Project, mrapi.Version]]:
         if not mods:
             return []
+        mc_version, mod_loader = self.mc_version, self.mod_loader
         def filter_version_loader(x: mrapi.Project|mrapi.Version):
-            if x.game_versions and not self.mc_version in x.game_versions:
-                return False
-            if x.loaders and not self.mod_loader in x.loaders:
-                return False
-            return True
-
-        result:List[Tuple[mrapi.Project, mrapi.Version]] = []
-        for pro in filter(filter_version_loader, mods):
-            versions = filter(filter_version_loader, self.mrcli.list_project_versions(pro.id))
-            versions = filter(lambda ver: (ver.version_type or "alpha") >= releaseType, versions)
-            versions = sorted(versions, key=(lambda v: MavenVersion(v.version_number or "0.0.0")), reverse = True)
-            versions = list(versions)
-            if versions:
-                result.append((pro, versions[0]))
-        return result
+            # each list is scanned exactly once, list.__contains__ beats building a set
+            game_versions, loaders = x.game_versions, x.loaders
+            return ((not game_versions or mc_version in game_versions)
+                and (not loaders or mod_loader in loaders))
+
+        projects = list(filter(filter_version_loader, mods))
+        cache = self._latest_version_cache
+        uncached = [pro for pro in projects if (pro.id, releaseTypeId) not in cache]
+
+        # pack the version ids of small projects into shared get_versions requests,
+        # projects with more versions than one batch holds are listed on their own
+        batches: List[List[str]] = []
+        listed: List[mrapi.Project] = []
+        batch: List[str] = []
+        for pro in uncached:
+            if pro.versions is None or len(pro.versions) > VERSION_BATCH_SIZE:
+                listed.append(pro)
+                continue
+            if len(batch) + len(pro.versions) > VERSION_BATCH_SIZE:
+                batches.append(batch)
+                batch = []
+            batch += pro.versions
+        if batch:
+            batches.append(batch)
+
+        responses = await asyncio.gather(
+            *(self._call(self.mrcli.get_versions, batch) for batch in batches),
+            *(self._call(self.mrcli.list_project_versions, pro.id) for pro in listed))
+        project_versions: Dict[str, List[mrapi.Version]] = { pro.id: [] for pro in uncached }
+        for ver in (ver for versions in responses for ver in versions):
+            if ver.project_id in project_versions:
+                project_versions[ver.project_id].append(ver)
+
+        for pro, versions in ((pro, project_versions[pro.id]) for pro in uncached):
+            cache[(pro.id, releaseTypeId)] = max((ver for ver in versions
+                    if release_type_lookup.get(ver.version_type or "alpha", 3) <= releaseTypeId
+                    if filter_version_loader(ver)),
+                key=(lambda v: _parse_maven(v.version_number or "0.0.0")), default = None)
+
+        return [(pro, version) for pro in projects
+            if (version := cache[(pro.id, releaseTypeId)])]
     
-    def search_modrinth(self, slugs: List[str], releaseType: Optional[str]) -> List[mrapi.Version]:
+    async def search_modrinth(self, slugs: List[str], releaseType: Optional[str],
+                              resolved: Optional[set[str]] = None,
+                              on_unknown: Optional[Callable[[List[str]], None]] = None) -> List[mrapi.Version]:
+        """
+        Search for mods on Modrinth and resolve their dependencies
+        The slugs of all picked projects, dependencies included, are added to `resolved`,
+        `on_unknown` is called early with the slugs Modrinth has no project for
+        """
         result: List[mrapi.Version] = []
-        releaseType = (releaseType or "alpha").lower()
+        if resolved is None:
+            resolved = set()
+        releaseTypeId = release_type_lookup.get((releaseType or "alpha").lower(), 3)
 
         
         bucket_mod: set[str] = set()
 
-        for (project, version) in self.get_latest_versions(self.mrcli.get_projects(slugs), releaseType):
+        found: set[str] = set()
+        projects = await self._call(self.mrcli.get_projects, slugs)
+        if on_unknown:
+            known = {name for project in projects for name in (project.slug, project.id)}
+            on_unknown([slug for slug in slugs if slug not in known])
+        for (project, version) in await self.get_latest_versions(projects, releaseTypeId):
             result.append(version)
-            slugs.remove(project.slug)
+            # the API accepts both slugs and ids
+            found.add(project.slug)
+            found.add(project.id)
             bucket_mod.add(project.id)
+            resolved.add(project.slug)
+        slugs[:] = [slug for slug in slugs if slug not in found]
 
         # resolve dependencies
-        bucket_ver: set[str] = set([ver.id for ver in result])
+        bucket_ver: set[str] = {ver.id for ver in result}
         versions = result
         while True:
-            dependencies = [depver
-                for version in versions
-                for depver in version.dependencies or []
-                if depver.dependency_type == "required"]
-
-            depmod = set(modid for dep in dependencies
-                if (modid := dep.project_id)
-                if modid not in bucket_mod)
-            depver = set(verid for dep in dependencies
-                if (verid := dep.version_id)
-                if verid not in bucket_ver)
-            depmodver = self.get_latest_versions(
-                    self.mrcli.get_projects(list(depmod)), releaseType
+            depmod: set[str] = set()
+            depver: set[str] = set()
+            for version in versions:
+                for dep in version.dependencies or []:
+                    if dep.dependency_type != "required":
+                        continue
+                    if (modid := dep.project_id) and modid not in bucket_mod:
+                        depmod.add(modid)
+                    if (verid := dep.version_id) and verid not in bucket_ver:
+                        depver.add(verid)
+            depmodver = await self.get_latest_versions(
+                    await self._call(self.mrcli.get_projects, list(depmod)), releaseTypeId
                     ) if depmod else []
-            bucket_mod = bucket_mod.union(project.id for project, _ in depmodver)
-            depver |= set(version.id for _, version in depmodver)
-            if not depver:
+            # also mark projects without a matching version, so they are not queried again
+            bucket_mod.update(depmod)
+            resolved.update(project.slug for project, _ in depmodver)
+            # the latest versions of new projects are already at hand, only fetch pinned ones
+            versions = [version for _, version in depmodver]
+            depver.difference_update(version.id for version in versions)
+            if depver:
+                versions += await self._call(self.mrcli.get_versions, list(depver))
+            if not versions:
                 break
-            versions = self.mrcli.get_versions(list(depver)) if depmod else []
-            bucket_ver = bucket_ver.union(ver.id for ver in versions)
+            bucket_ver.update(ver.id for ver in versions)
             result += versions
 
         # mark the primary file explicitly
@@ -95,68 +215,129 @@ class ModSearcher:
                     version.files[0].primary = True
         return result
         
-    def get_latest_file(self, mod: cfapi.Mod, releaseTypeId: int):
+    def get_latest_file(self, mod: cfapi.Mod, releaseTypeId: int) -> asyncio.Task:
+        """Memoized _get_latest_file, concurrent lookups of the same mod share one task"""
+        key = (mod.id, releaseTypeId)
+        if key not in self._latest_file_cache:
+            self._latest_file_cache[key] = asyncio.ensure_future(self._get_latest_file(mod, releaseTypeId))
+        return self._latest_file_cache[key]
+
+    async def get_latest_files(self, mods: List[cfapi.Mod], releaseTypeId: int) -> List[Optional[cfapi.File]]:
+        """
+        Latest file of each mod, in the same order.
+        File ids are picked from `latestFilesIndexes` and fetched in one batched request,
+        mods without a matching index entry fall back to listing their files.
+        """
+        if not self.cfcli:
+            return [None for _ in mods]
+        cache = self._latest_file_cache
+
+        indexed: Dict[int, int] = {} # mod id -> file id
+        for mod in mods:
+            if (mod.id, releaseTypeId) in cache:
+                continue
+            candidates = [index.fileId for index in mod.latestFilesIndexes or []
+                if index.gameVersion == self.mc_version
+                if not self.mod_loader_id or index.modLoader == self.mod_loader_id
+                if (index.releaseType or 3) <= releaseTypeId]
+            if candidates:
+                indexed[mod.id] = max(candidates)
+
+        if indexed:
+            files = {file.modId: file
+                for file in await self._call(self.cfcli.get_files, list(indexed.values()))
+                if file.isAvailable}
+            for mod in mods:
+                if (file := files.get(mod.id)) and (mod.id, releaseTypeId) not in cache:
+                    cache[(mod.id, releaseTypeId)] = asyncio.ensure_future(self._complete_file(mod, file))
+
+        return list(await asyncio.gather(*(self.get_latest_file(mod, releaseTypeId) for mod in mods)))
+
+    async def _get_latest_file(self, mod: cfapi.Mod, releaseTypeId: int) -> Optional[cfapi.File]:
         if not self.cfcli:
             return
 
         index = 0
-        MAX_PAGE_SIZE = 50
+        MAX_PAGE_SIZE = 50 # the largest page CurseForge serves
         while True:
-            response = self.cfcli.get_mod_files(
+            response = await self._call(self.cfcli.get_mod_files,
                 modId = mod.id,
                 gameVersion = self.mc_version,
                 modLoaderType = self.mod_loader_id,
                 index = index,
                 pageSize = MAX_PAGE_SIZE)
-            availableFiles = [file for file in response.data
+            # files are listed newest first, stop at the first match
+            file = next((file for file in response.data
                  if (file.releaseType or 3) <= releaseTypeId
-                 if file.isAvailable]
-
-            if availableFiles:
-                file = availableFiles[0]
-                break
+                 if file.isAvailable), None)
+            if file:
+                return await self._complete_file(mod, file)
 
             pagination = response.pagination
             index = pagination.index + pagination.resultCount
-            if index == pagination.totalCount:
+            if index >= pagination.totalCount or not pagination.resultCount:
                 return
 
+    async def _complete_file(self, mod: cfapi.Mod, file: cfapi.File) -> cfapi.File:
+        """Fill in the file name and download url if the API left them out"""
         if not file.fileName:
             file.fileName = mod.slug + "-" + self.mod_loader + self.mc_version
-        if not file.downloadUrl:
-            file.downloadUrl = self.cfcli.get_file_download_url(mod.id, file.id)
+        if not file.downloadUrl and self.cfcli:
+            file.downloadUrl = await self._call(self.cfcli.get_file_download_url, mod.id, file.id)
         return file
 
-    def search_curseforge(self, slugs: List[str], releaseType: Optional[str]) -> List[cfapi.File]:
-        """Search for a mod on CurseForge"""
+    async def _search_curseforge_slug(self, slug: str) -> Optional[cfapi.Mod]:
+        """Look up a single slug on CurseForge"""
+        if not self.cfcli:
+            return
+        modlist = (await self._call(self.cfcli.search_mods,
+                gameId = 432, # Minecraft
+                classId = 6, # Mods
+                gameVersion = self.mc_version,
+                modLoaderType = self.mod_loader_id,
+                slug = slug,
+                sortField=2,
+                sortOrder=SortOrder.Desc,
+                )).data
+        return modlist[0] if modlist else None
+
+    async def lookup_curseforge(self, slugs: List[str]) -> Dict[str, cfapi.Mod]:
+        """Look up slugs on CurseForge, returns slug -> mod for those found"""
+        mods = await asyncio.gather(*(self._search_curseforge_slug(slug) for slug in slugs))
+        return {slug: mod for slug, mod in zip(slugs, mods) if mod}
+
+    async def search_curseforge(self, slugs: List[str], releaseType: Optional[str],
+                                lookup: Optional[Dict[str, cfapi.Mod]] = None,
+                                skip: Optional[set[str]] = None) -> List[cfapi.File]:
+        """
+        Search for a mod on CurseForge
+        `lookup` is the result of lookup_curseforge() if it has already been done,
+        dependencies whose slug is in `skip` (e.g. resolved on modrinth) are left out
+        """
+        skip = skip or set()
         if not self.cfcli:
             return []
 
-        releaseType = (releaseType or "alpha").lower()
-        releaseTypeId = { "release": 1, "beta": 2, "alpha": 3 }.get(releaseType, 0)
-
-        modfiles = [(mod.slug, file) for slug in slugs
-            if (modlist := self.cfcli.search_mods(
-                    gameId = 432, # Minecraft
-                    classId = 6, # Mods
-                    gameVersion = self.mc_version,
-                    modLoaderType = self.mod_loader_id,
-                    slug = slug,
-                    sortField=2,
-                    sortOrder=SortOrder.Desc,
-                    ).data)
-            if (mod := modlist[0])
-            if (file := self.get_latest_file(mod, releaseTypeId))]
+        releaseTypeId = release_type_lookup.get((releaseType or "alpha").lower(), 3)
+
+        if lookup is None:
+            lookup = await self.lookup_curseforge(slugs)
+        slugmods = [(slug, mod) for slug in slugs if (mod := lookup.get(slug))]
+        latest = await self.get_latest_files([mod for _, mod in slugmods], releaseTypeId)
 
         files: list[cfapi.File] = []
-        bucket: set[str] = set()
-        for slug,file in modfiles:
-            slugs.remove(slug)
+        bucket: set[int] = set()
+        found: set[str] = set()
+        for (slug, mod), file in zip(slugmods, latest):
+            if not file:
+                continue
+            found.add(slug)
             files.append(file)
-            bucket.add(slug)
+            bucket.add(mod.id)
+        slugs[:] = [slug for slug in slugs if slug not in found]
 
         # resolve dependencies
-        result = files
+        result = files[:]
         while True:
             # being a set, duplicate elements are removed
             if not (depModIds := set(modid
@@ -165,18 +346,34 @@ class ModSearcher:
                     if dependency.relationType == 3 # only resolve required dependency
                     if (modid := dependency.modId) not in bucket)):
                 break
-            modfiles = [(mod.slug, file)
-                for mod in self.cfcli.get_mods(list(depModIds))
-                if (file := self.get_latest_file(mod, releaseTypeId))]
-            for slug, file in modfiles:
-                result.append(file)
-                bucket.add(slug)
+            bucket |= depModIds
+            mods = [mod for mod in await self._call(self.cfcli.get_mods, list(depModIds))
+                if mod.slug not in skip]
+            files = [file for file in await self.get_latest_files(mods, releaseTypeId) if file]
+            result += files
         return result
 
-    def search_mods(self, slugs: List[str], releaseType: Optional[str]) -> List[FileMetadata]:
+    async def search_mods(self, slugs: List[str], releaseType: Optional[str]) -> List[FileMetadata]:
+        # slugs unknown to modrinth are looked up on curseforge while modrinth resolves the rest
+        cf_lookup: Optional[asyncio.Task] = None
+        looked_up: set[str] = set()
+        def lookup_unknown(unknown: List[str]):
+            nonlocal cf_lookup
+            if self.cfcli and unknown:
+                cf_lookup = asyncio.ensure_future(self.lookup_curseforge(unknown))
+                looked_up.update(unknown)
+
         # prefer modrinth API
         print('searching modrinth...')
-        modrinth_mods = self.search_modrinth(slugs, releaseType)
+        resolved: set[str] = set()
+        try:
+            modrinth_mods = await self.search_modrinth(slugs, releaseType, resolved, lookup_unknown)
+        except BaseException:
+            if cf_lookup:
+                cf_lookup.cancel()
+                # retrieve the exception of an already failed lookup, it is not reported
+                cf_lookup.add_done_callback(lambda task: task.cancelled() or task.exception())
+            raise
         files_to_download = [
             FileMetadata(
                 url = file.url,
@@ -195,6 +392,10 @@ class ModSearcher:
         print('Info: the following mods cannot be found on modrinth:')
         print(', '.join(slugs))
         print('searching on curseforge...')
+        lookup = await cf_lookup if cf_lookup else {}
+        # slugs known to modrinth but without a matching version are not looked up yet
+        if rest := [slug for slug in slugs if slug not in looked_up]:
+            lookup.update(await self.lookup_curseforge(rest))
         files_to_download += [
             FileMetadata(
                 # will not be None, see get_latest_file()
@@ -206,7 +407,7 @@ class ModSearcher:
                 md5 = hashes.get(2),
                 sha512 = None,
             )
-            for file in self.search_curseforge(slugs, releaseType)
-            if (hashes := { h.algo:h.value for h in file.hashes or [] }) or 1
+            for file in await self.search_curseforge(slugs, releaseType, lookup, resolved)
+            for hashes in (_cf_hashes(file),)
         ]
         return files_to_download
@@ -521,7 +521,7 @@ class VersionRange:
             intersection 
             for s1 in self.segments
             for s2 in other.segments
-            if (intersection := s1 and s2)
+            if (intersection := s1 & s2)
         ]
         s1, s2 = self.soft, other.soft
         result.soft = s1 if s1 and (not s2 or s1 > s2) else s2
@@ -9,11 +9,11 @@ import click
 import sys
 import argparse
 from src.lib.downloader import download_files
-from src.lib.searcher import ModSearcher, mod_loader_lookup
+from src.lib.searcher import ModSearcher, mod_loader_lookup, release_type_lookup
 from typing import List
 
 valid_loaders = mod_loader_lookup.keys()
-valid_release_types = set(['release', 'beta', 'alpha'])
+valid_release_types = release_type_lookup.keys()
 valid_loaders_str = ', '.join(valid_loaders)
 
 def execute(args: argparse.Namespace):
@@ -35,8 +35,15 @@ def execute(args: argparse.Namespace):
     if not curseforge_api_key:
         print("Warning: CURSEFORGE_API_KEY not set. CurseForge mods will not be available.")
 
-    searcher = ModSearcher(mc_version, mod_loader, curseforge_api_key)
-    files = searcher.search_mods(slugs, releaseType)
+    parallel: int = args.parallel or 5
+    searcher = ModSearcher(mc_version, mod_loader, curseforge_api_key, parallel, not args.no_cache)
+    try:
+        asyncio.run(search_and_download(searcher, slugs, releaseType, parallel))
+    finally:
+        searcher.close()
+
+async def search_and_download(searcher: ModSearcher, slugs: List[str], releaseType: str, parallel: int):
+    files = await searcher.search_mods(slugs, releaseType)
 
     HOME_DIR = os.getenv('HOME') or '~'
     TARGET_DIR = HOME_DIR + '/.cache/mcmod/mods/'
@@ -48,7 +55,9 @@ def execute(args: argparse.Namespace):
         print(f'Nothing to do.')
         return
 
-    filestat = [(file, os.path.exists(TARGET_DIR + file.dest)) for file in files]
+    # one directory read instead of a stat per file
+    existing = {entry.name for entry in os.scandir(TARGET_DIR)} if os.path.isdir(TARGET_DIR) else set()
+    filestat = [(file, file.dest in existing) for file in files]
 
     for file,stat in filestat:
         if stat:
@@ -66,7 +75,7 @@ def execute(args: argparse.Namespace):
         print('Download canceled')
         return
 
-    asyncio.run(download_files(files, args.parallel or 5))
+    await download_files(files, parallel)
 
 def addparser(subparsers):
     parser: argparse.ArgumentParser
@@ -75,5 +84,6 @@ def addparser(subparsers):
     parser.add_argument('-g', '--game-version', help='MineCraft version string (e.g. 1.20.1)')
     parser.add_argument('-m', '--mod-loader', help=f'Mod loader name, available options: {valid_loaders_str}')
     parser.add_argument('-r', '--release-type', help=f'Release type, default "release", other options: "beta", "alpha"');
-    parser.add_argument('-p', '--parallel', help=f'number of parallel threads to download, default is 5');
+    parser.add_argument('-p', '--parallel', type=int, help=f'number of parallel requests and downloads, default is 5');
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the on-disk cache of API responses')
     parser.set_defaults(func=execute)
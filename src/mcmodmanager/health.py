@@ -6,6 +6,8 @@ Generated by Claude Sonnet 4.5
 """
 
 import argparse
+import operator
+from functools import reduce
 from pathlib import Path
 from typing import List, Dict, Tuple, Set
 from src.lib.version import MavenVersion, VersionRange
@@ -17,7 +19,7 @@ class DependencyChecker:
     def __init__(self, mods: List[ModInfo]):
         self.mods = mods
         self.mod_map: Dict[str, ModInfo] = {}
-        self.special_requirements: Dict[str, List[Tuple[str, str]]] = {}  # special_mod_id -> [(mod_name, version_range)]
+        self.special_requirements: Dict[str, Dict[str, List[str]]] = {}  # special_mod_id -> version_range -> [mod_name]
         self._build_mod_map()
         self._collect_special_requirements()
     
@@ -34,46 +36,51 @@ class DependencyChecker:
         for mod in self.mods:
             for dep in mod.dependencies:
                 if dep.is_special and dep.mandatory:
-                    if dep.mod_id not in self.special_requirements:
-                        self.special_requirements[dep.mod_id] = []
-                    self.special_requirements[dep.mod_id].append((mod.name, dep.version_range))
+                    self.special_requirements.setdefault(dep.mod_id, {}).setdefault(dep.version_range, []).append(mod.name)
 
-    def check_dependencies(self) -> Tuple[List[str], List[str]]:
+    def check_dependencies(self, include_success: bool = True) -> Tuple[List[str], List[str]]:
         """
         Check if all dependencies are satisfied.
         Returns (all_satisfied, list_of_issues)
+        Lines for satisfied dependencies are only built if include_success is set.
         """
         issues = []
         info = []
         
+        mod_map = self.mod_map
+        info_append, issues_append = info.append, issues.append
+        
         for mod in self.mods:
             for dep in mod.dependencies:
                 if dep.is_special or not dep.mandatory:
                     continue  # Skip special mods and optional deps
                 
-                if dep.mod_id not in self.mod_map:
-                    issues.append(
-                        f"❌ {mod.name} ({mod.mod_id}) requires {dep.mod_id} {dep.version_range} - NOT FOUND"
+                dep_mod_id = dep.mod_id
+                dep_range = dep.version_range
+                dep_mod = mod_map.get(dep_mod_id)
+                if dep_mod is None:
+                    issues_append(
+                        f"❌ {mod.name} ({mod.mod_id}) requires {dep_mod_id} {dep_range} - NOT FOUND"
                     )
                 else:
                     # Dependency found
-                    dep_mod = self.mod_map[dep.mod_id]
                     try:
-                        version_range = VersionRange(dep.version_range)
+                        version_range = VersionRange(dep_range)
                         dep_version = MavenVersion(dep_mod.version)
                         
                         if version_range.contains(dep_version):
-                            info.append(
-                                f"✓ {mod.name} ({mod.mod_id}) requires {dep.mod_id} {dep.version_range} - found v{dep_mod.version}"
-                            )
+                            if include_success:
+                                info_append(
+                                    f"✓ {mod.name} ({mod.mod_id}) requires {dep_mod_id} {dep_range} - found v{dep_mod.version}"
+                                )
                         else:
-                            issues.append(
-                                f"❌ {mod.name} ({mod.mod_id}) requires {dep.mod_id} {dep.version_range} - found v{dep_mod.version} (INCOMPATIBLE)"
+                            issues_append(
+                                f"❌ {mod.name} ({mod.mod_id}) requires {dep_mod_id} {dep_range} - found v{dep_mod.version} (INCOMPATIBLE)"
                             )
                     except Exception:
                         # Fallback if version parsing fails
-                        issues.append(
-                            f"⚠️  {mod.name} ({mod.mod_id}) requires {dep.mod_id} {dep.version_range} - found v{dep_mod.version} (cannot verify)"
+                        issues_append(
+                            f"⚠️  {mod.name} ({mod.mod_id}) requires {dep_mod_id} {dep_range} - found v{dep_mod.version} (cannot verify)"
                         )
         
         return info, issues
@@ -86,19 +93,13 @@ class DependencyChecker:
         summary = []
         
         for special_mod_id in sorted(self.special_requirements.keys()):
-            requirements = self.special_requirements[special_mod_id]
+            version_groups = self.special_requirements[special_mod_id]
             
             summary.append(f"\n{special_mod_id.upper()}:")
             
             # Compute intersection of all version ranges
             try:
-                combined_range = None
-                for mod_name, version_range_str in requirements:
-                    version_range = VersionRange(version_range_str)
-                    if combined_range is None:
-                        combined_range = version_range
-                    else:
-                        combined_range = combined_range and version_range
+                combined_range = reduce(operator.and_, map(VersionRange, version_groups))
                 
                 if combined_range:
                     summary.append(f"  Required version: {combined_range}")
@@ -108,12 +109,6 @@ class DependencyChecker:
                 if verbose:
                     # Show individual requirements
                     summary.append(f"  Individual requirements:")
-                    version_groups: Dict[str, List[str]] = {}
-                    for mod_name, version_range in requirements:
-                        if version_range not in version_groups:
-                            version_groups[version_range] = []
-                        version_groups[version_range].append(mod_name)
-                    
                     for version_range in sorted(version_groups.keys()):
                         mod_names = version_groups[version_range]
                         if len(mod_names) <= 3:
@@ -132,8 +127,9 @@ class DependencyChecker:
             except Exception as e:
                 summary.append(f"  ⚠️  Error computing version intersection: {e}")
                 # Fallback to simple listing
-                for mod_name, version_range in requirements:
-                    summary.append(f"    {version_range} - {mod_name}")
+                for version_range, mod_names in version_groups.items():
+                    for mod_name in mod_names:
+                        summary.append(f"    {version_range} - {mod_name}")
         
         return summary
 
@@ -149,12 +145,11 @@ class DependencyChecker:
 
 def execute(args):
     # Parse all mods
-    mods = []
-    for mod_file in args.mods:
+    mods: List[ModInfo] = []
+    for mod_file, parsed in ModParser.iter_parse([Path(mod_file) for mod_file in args.mods]):
         if args.verbose:
-            print(f"Parsing {mod_file}...")
-        mod_info = ModParser.parse_mod_file(Path(mod_file))
-        mods += mod_info
+            print(f"Parsed {mod_file}")
+        mods += parsed
 
     print(f"\nSuccessfully parsed {len(mods)} mod(s)\n")
     
@@ -172,7 +167,7 @@ def execute(args):
 
         for mod in mods:
             if bucket[mod.mod_id] > 1 and not mod.is_jar_in_jar:
-                print(f"Warning: duplicate mod {mod.name} {mod.file_path.name}")
+                print(f"Warning: duplicate mod {mod.name} {mod.file_path.name if mod.file_path else '?'}")
 
             prefix = "  └─ " if mod.is_jar_in_jar else ""
             print(f"\n{prefix}{mod.name}")
@@ -182,7 +177,7 @@ def execute(args):
             if mod.is_jar_in_jar:
                 print(f"{prefix}  Source: Jar-in-Jar from {mod.parent_mod}")
             else:
-                print(f"{prefix}  File: {mod.file_path.name}")
+                print(f"{prefix}  File: {mod.file_path.name if mod.file_path else '?'}")
             if mod.dependencies:
                 print(f"{prefix}  Dependencies:")
                 for dep in mod.dependencies:
@@ -192,7 +187,7 @@ def execute(args):
     
     # Check dependencies
     checker = DependencyChecker(mods)
-    info, issues = checker.check_dependencies()
+    info, issues = checker.check_dependencies(include_success=args.verbose)
 
     print("=" * 60)
     print("DEPENDENCY CHECK RESULTS")
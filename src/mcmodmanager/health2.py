@@ -6,17 +6,21 @@ Supports: Forge, NeoForge, Fabric, Quilt, LiteLoader, Cauldron
 """
 
 import argparse
-import json
+import io
 import zipfile
-import toml
-import tempfile
-import shutil
+import tomllib
 import re
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Callable, Dict, List, Set, Tuple, Optional
 from dataclasses import dataclass, field
 from enum import Enum
-from functools import total_ordering
+from functools import cache, lru_cache, reduce, total_ordering
+
+# orjson is optional, both accept the raw bytes read from the jar
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 
 class ModLoader(Enum):
@@ -29,7 +33,7 @@ class ModLoader(Enum):
 
 
 # Special mod IDs that represent the game/loader itself
-SPECIAL_MODS = {
+SPECIAL_MODS = frozenset({
     'minecraft',
     'forge',
     'neoforge',
@@ -39,8 +43,49 @@ SPECIAL_MODS = {
     'cauldron',
     'java',
     'fml'  # Forge Mod Loader
+})
+
+
+def _is_special(mod_id: str) -> bool:
+    """Check if mod_id is a special mod, trying it as-is first since ids are usually lowercase"""
+    return mod_id in SPECIAL_MODS or mod_id.lower() in SPECIAL_MODS
+
+
+# Common file name patterns, tried in order by _parse_from_filename
+_FILENAME_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'^(.+?)[-_](\d+(?:\.\d+)*(?:[-+].+?)?)$',  # modid-1.2.3 or modid_1.2.3
+    r'^(.+?)[-_]mc\d+\.\d+(?:\.\d+)?[-_](\d+(?:\.\d+)*(?:[-+].+?)?)$',  # modid-mc1.19.2-1.2.3
+    r'^(.+?)[-_](?:forge|fabric|quilt)[-_](\d+(?:\.\d+)*(?:[-+].+?)?)$',  # modid-forge-1.2.3
+))
+
+# Version at the end of a jar file name, fallback for ${file.jarVersion}
+_JAR_VERSION_RE = re.compile(r'[-_](\d+(?:\.\d+)*(?:[-+].+?)?)\.jar$')
+
+# Implementation-Version entry of a MANIFEST.MF
+_IMPL_VERSION_RE = re.compile(rb'^Implementation-Version:[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
+
+# Separators between version segments
+_VERSION_SPLIT_RE = re.compile(r'[.\-]')
+
+# Ordering of known qualifiers, all of them sort before numbers
+_QUALIFIER_RANKS = {
+    'alpha': 1, 'a': 1,
+    'beta': 2, 'b': 2,
+    'milestone': 3, 'm': 3,
+    'rc': 4, 'cr': 4,
+    'snapshot': 5,
+    'final': 6, 'ga': 6,
 }
 
+# Numeric prefix of a mixed segment such as 0+build
+_LEADING_DIGITS_RE = re.compile(r'\d+')
+
+# Key of a missing (or zero) numeric segment
+_ZERO = (1, 0, '')
+
+# Characters that make a range more than a plain version
+_RANGE_SPECIALS_RE = re.compile(r'[\[\](),]')
+
 
 @total_ordering
 class MavenVersion:
@@ -49,40 +94,44 @@ class MavenVersion:
     Handles versions like: 1.2.3, 1.2.3-alpha, 1.2-SNAPSHOT, etc.
     """
     
+    __slots__ = ('original', 'key', 'numeric')
+    
     def __init__(self, version_str: str):
         self.original = version_str
-        self.parts = self._parse(version_str)
+        self.key = self._parse(version_str)
+        # Only numeric segments, e.g. 1.20.1: missing segments need no padding
+        self.numeric = all(part[0] == 1 for part in self.key)
     
-    def _parse(self, version_str: str):
-        """Parse version into comparable parts"""
+    def _parse(self, version_str: str) -> tuple:
+        """
+        Parse version into a comparable key.
+        Known qualifiers sort before numbers (by rank), anything else after them.
+        Trailing zeros are dropped so that 1.0 and 1 share a key.
+        """
         # Split by dots and dashes
-        parts = []
-        for segment in re.split(r'[.\-]', version_str):
+        key = []
+        for segment in _VERSION_SPLIT_RE.split(version_str):
             if segment.isdigit():
-                parts.append(('int', int(segment)))
+                key.append((1, int(segment), ''))
             elif segment:
-                # Known qualifiers have specific ordering
                 segment_lower = segment.lower()
-                if segment_lower in ['alpha', 'a']:
-                    parts.append(('qualifier', 1, segment))
-                elif segment_lower in ['beta', 'b']:
-                    parts.append(('qualifier', 2, segment))
-                elif segment_lower in ['milestone', 'm']:
-                    parts.append(('qualifier', 3, segment))
-                elif segment_lower in ['rc', 'cr']:
-                    parts.append(('qualifier', 4, segment))
-                elif segment_lower == 'snapshot':
-                    parts.append(('qualifier', 5, segment))
-                elif segment_lower == 'final' or segment_lower == 'ga':
-                    parts.append(('qualifier', 6, segment))
+                rank = _QUALIFIER_RANKS.get(segment_lower)
+                number = _LEADING_DIGITS_RE.match(segment_lower)
+                if rank is not None:
+                    key.append((0, rank, ''))
+                elif number:
+                    # 0+build sorts right after 0
+                    key.append((1, int(number.group()), segment_lower[number.end():]))
                 else:
-                    parts.append(('str', segment.lower(), segment))
-        return parts
+                    key.append((2, 0, segment_lower))
+        while key and key[-1] == _ZERO:
+            key.pop()
+        return tuple(key)
     
     def __eq__(self, other):
         if not isinstance(other, MavenVersion):
             return False
-        return self._compare(other) == 0
+        return self.key == other.key
     
     def __lt__(self, other):
         if not isinstance(other, MavenVersion):
@@ -90,34 +139,16 @@ class MavenVersion:
         return self._compare(other) < 0
     
     def _compare(self, other):
-        """Compare two versions"""
-        for i in range(max(len(self.parts), len(other.parts))):
-            p1 = self.parts[i] if i < len(self.parts) else ('int', 0)
-            p2 = other.parts[i] if i < len(other.parts) else ('int', 0)
-            
-            # Compare by type first
-            if p1[0] == 'int' and p2[0] == 'int':
-                if p1[1] != p2[1]:
-                    return p1[1] - p2[1]
-            elif p1[0] == 'int' and p2[0] == 'qualifier':
-                # Numbers before qualifiers
-                return 1
-            elif p1[0] == 'qualifier' and p2[0] == 'int':
-                return -1
-            elif p1[0] == 'qualifier' and p2[0] == 'qualifier':
-                if p1[1] != p2[1]:
-                    return p1[1] - p2[1]
-                # Same qualifier level, compare strings
-                if len(p1) > 2 and len(p2) > 2:
-                    if p1[2] != p2[2]:
-                        return -1 if p1[2] < p2[2] else 1
-            elif p1[0] == 'str' or p2[0] == 'str':
-                s1 = p1[1] if p1[0] == 'str' else str(p1[1])
-                s2 = p2[1] if p2[0] == 'str' else str(p2[1])
-                if s1 != s2:
-                    return -1 if s1 < s2 else 1
-        
-        return 0
+        """Compare two versions, missing segments count as 0"""
+        k1, k2 = self.key, other.key
+        if self.numeric and other.numeric:
+            # Trailing zeros are dropped, so a shorter numeric key is smaller
+            return (k1 > k2) - (k1 < k2)
+        if len(k1) < len(k2):
+            k1 += (_ZERO,) * (len(k2) - len(k1))
+        elif len(k2) < len(k1):
+            k2 += (_ZERO,) * (len(k1) - len(k2))
+        return (k1 > k2) - (k1 < k2)
     
     def __str__(self):
         return self.original
@@ -126,10 +157,50 @@ class MavenVersion:
         return f"MavenVersion('{self.original}')"
     
     def __hash__(self):
-        return hash(self.original)
+        return hash(self.key)
+
+
+def _max_of_mins(min1: Optional[MavenVersion], inc1: bool,
+                 min2: Optional[MavenVersion], inc2: bool) -> Tuple[Optional[MavenVersion], bool]:
+    """Tighter of two lower bounds, None meaning unbounded"""
+    if min1 is None:
+        return min2, inc2
+    if min2 is None:
+        return min1, inc1
+    cmp = min1._compare(min2)
+    if cmp:
+        return (min1, inc1) if cmp > 0 else (min2, inc2)
+    return min1, inc1 and inc2
+
 
+def _min_of_maxes(max1: Optional[MavenVersion], inc1: bool,
+                  max2: Optional[MavenVersion], inc2: bool) -> Tuple[Optional[MavenVersion], bool]:
+    """Tighter of two upper bounds, None meaning unbounded"""
+    if max1 is None:
+        return max2, inc2
+    if max2 is None:
+        return max1, inc1
+    cmp = max1._compare(max2)
+    if cmp:
+        return (max1, inc1) if cmp < 0 else (max2, inc2)
+    return max1, inc1 and inc2
 
-@dataclass
+
+def _in_interval(version: MavenVersion, min_ver: Optional[MavenVersion], min_inc: bool,
+                 max_ver: Optional[MavenVersion], max_inc: bool) -> bool:
+    """Check if a version lies within one interval of a range"""
+    if min_ver is not None:
+        cmp = version._compare(min_ver)
+        if cmp < 0 or (cmp == 0 and not min_inc):
+            return False
+    if max_ver is not None:
+        cmp = version._compare(max_ver)
+        if cmp > 0 or (cmp == 0 and not max_inc):
+            return False
+    return True
+
+
+@dataclass(slots=True)
 class VersionRange:
     """
     Represents a Maven version range.
@@ -138,15 +209,23 @@ class VersionRange:
             1.0 means >= 1.0 (soft requirement)
     """
     intervals: List[Tuple[Optional[MavenVersion], bool, Optional[MavenVersion], bool]]  # (min, min_inclusive, max, max_inclusive)
+    _single: Optional[Tuple[Optional[MavenVersion], bool, Optional[MavenVersion], bool]] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._single = self.intervals[0] if len(self.intervals) == 1 else None
     
     @staticmethod
     def parse(range_str: str) -> 'VersionRange':
         """Parse a Maven version range string"""
         range_str = range_str.strip()
         
+        # Any version
+        if range_str == '*':
+            return VersionRange([(None, True, None, False)])
+        
         # Simple version (soft requirement >= version)
-        if not any(c in range_str for c in '[](),'):
-            return VersionRange([(MavenVersion(range_str), True, None, False)])
+        if not _RANGE_SPECIALS_RE.search(range_str):
+            return VersionRange([(_make_version(range_str), True, None, False)])
         
         intervals = []
         
@@ -170,39 +249,29 @@ class VersionRange:
                 # Split the range
                 versions = [v.strip() for v in part.split(',')]
                 
-                min_ver = MavenVersion(versions[0]) if versions[0] else None
-                max_ver = MavenVersion(versions[1]) if len(versions) > 1 and versions[1] else None
+                min_ver = _make_version(versions[0]) if versions[0] else None
+                max_ver = _make_version(versions[1]) if len(versions) > 1 and versions[1] else None
                 
                 intervals.append((min_ver, min_inclusive, max_ver, max_inclusive))
         
         if not intervals:
             # Fallback: treat as soft requirement
-            intervals.append((MavenVersion(range_str), True, None, False))
+            intervals.append((_make_version(range_str), True, None, False))
         
         return VersionRange(intervals)
     
     def contains(self, version: MavenVersion) -> bool:
         """Check if a version satisfies this range"""
+        # Most ranges are a single interval
+        if self._single is not None:
+            return _in_interval(version, *self._single)
+        
         if not self.intervals:
             return True
         
-        for min_ver, min_inc, max_ver, max_inc in self.intervals:
-            # Check minimum
-            if min_ver:
-                if min_inc and version < min_ver:
-                    continue
-                if not min_inc and version <= min_ver:
-                    continue
-            
-            # Check maximum
-            if max_ver:
-                if max_inc and version > max_ver:
-                    continue
-                if not max_inc and version >= max_ver:
-                    continue
-            
-            # Passed all checks for this interval
-            return True
+        for interval in self.intervals:
+            if _in_interval(version, *interval):
+                return True
         
         return False
     
@@ -216,31 +285,10 @@ class VersionRange:
                 min1, min_inc1, max1, max_inc1 = int1
                 min2, min_inc2, max2, max_inc2 = int2
                 
-                # New minimum is the maximum of the two minimums
-                if min1 is None:
-                    new_min, new_min_inc = min2, min_inc2
-                elif min2 is None:
-                    new_min, new_min_inc = min1, min_inc1
-                elif min1 > min2:
-                    new_min, new_min_inc = min1, min_inc1
-                elif min1 < min2:
-                    new_min, new_min_inc = min2, min_inc2
-                else:  # Equal
-                    new_min = min1
-                    new_min_inc = min_inc1 and min_inc2
-                
-                # New maximum is the minimum of the two maximums
-                if max1 is None:
-                    new_max, new_max_inc = max2, max_inc2
-                elif max2 is None:
-                    new_max, new_max_inc = max1, max_inc1
-                elif max1 < max2:
-                    new_max, new_max_inc = max1, max_inc1
-                elif max1 > max2:
-                    new_max, new_max_inc = max2, max_inc2
-                else:  # Equal
-                    new_max = max1
-                    new_max_inc = max_inc1 and max_inc2
+                # New minimum is the maximum of the two minimums,
+                # new maximum is the minimum of the two maximums
+                new_min, new_min_inc = _max_of_mins(min1, min_inc1, min2, min_inc2)
+                new_max, new_max_inc = _min_of_maxes(max1, max_inc1, max2, max_inc2)
                 
                 # Check if interval is valid
                 if new_min and new_max:
@@ -280,7 +328,19 @@ class VersionRange:
         return len(self.intervals) == 0
 
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _make_version(version_str: str) -> MavenVersion:
+    """Parse a version string, sharing one instance per distinct string"""
+    return MavenVersion(version_str)
+
+
+@lru_cache(maxsize=4096)
+def _make_range(range_str: str) -> VersionRange:
+    """Parse a version range string, sharing one instance per distinct string"""
+    return VersionRange.parse(range_str)
+
+
+@dataclass(frozen=True, slots=True)
 class Dependency:
     mod_id: str
     version_range: str = "*"
@@ -289,7 +349,14 @@ class Dependency:
     is_special: bool = False
 
 
-@dataclass
+@lru_cache(maxsize=8192)
+def _intern_dep(mod_id: str, version_range: str = "*", mandatory: bool = True,
+                ordering: str = "NONE", is_special: bool = False) -> Dependency:
+    """Create a Dependency, sharing one instance between identical declarations"""
+    return Dependency(mod_id, version_range, mandatory, ordering, is_special)
+
+
+@dataclass(slots=True)
 class ModInfo:
     mod_id: str
     name: str
@@ -311,27 +378,33 @@ class ModParser:
         Parse a mod JAR file and extract metadata.
         Returns a list of ModInfo (main mod + any nested Jar-in-Jar mods)
         """
-        mods = []
-        
         try:
             with zipfile.ZipFile(file_path, 'r') as jar:
-                # Parse main mod
-                main_mod = ModParser._parse_main_mod(jar, file_path)
-                if main_mod:
-                    mods.append(main_mod)
-                
-                # Extract and parse nested JARs if enabled
-                if extract_nested:
-                    nested_mods = ModParser._extract_jar_in_jar(jar, file_path, main_mod)
-                    mods.extend(nested_mods)
+                return ModParser._parse_open_zip(jar, file_path, extract_nested)
                 
         except Exception as e:
             print(f"Error parsing {file_path.name}: {e}")
             return []
+    
+    @staticmethod
+    def _parse_open_zip(jar: zipfile.ZipFile, display_path: Path, extract_nested: bool = True) -> List[ModInfo]:
+        """Parse the main mod (and nested JARs if enabled) of an opened JAR file"""
+        mods = []
+        
+        # Parse main mod
+        names = set(jar.namelist())
+        main_mod = ModParser._parse_main_mod(jar, display_path, names)
+        if main_mod:
+            mods.append(main_mod)
+        
+        # Extract and parse nested JARs if enabled
+        if extract_nested:
+            nested_mods = ModParser._extract_jar_in_jar(jar, display_path, main_mod, names)
+            mods.extend(nested_mods)
         
         # If no mods parsed, try to extract from filename
         if not mods:
-            fallback_mod = ModParser._parse_from_filename(file_path)
+            fallback_mod = ModParser._parse_from_filename(display_path)
             if fallback_mod:
                 mods.append(fallback_mod)
         
@@ -346,14 +419,8 @@ class ModParser:
         name = file_path.stem  # Remove .jar
         
         # Try common patterns
-        patterns = [
-            r'^(.+?)[-_](\d+(?:\.\d+)*(?:[-+].+?)?)$',  # modid-1.2.3 or modid_1.2.3
-            r'^(.+?)[-_]mc\d+\.\d+(?:\.\d+)?[-_](\d+(?:\.\d+)*(?:[-+].+?)?)$',  # modid-mc1.19.2-1.2.3
-            r'^(.+?)[-_](?:forge|fabric|quilt)[-_](\d+(?:\.\d+)*(?:[-+].+?)?)$',  # modid-forge-1.2.3
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, name)
+        for pattern in _FILENAME_PATTERNS:
+            match = pattern.match(name)
             if match:
                 mod_id = match.group(1).lower().replace('-', '_').replace(' ', '_')
                 version = match.group(2)
@@ -377,28 +444,28 @@ class ModParser:
         )
     
     @staticmethod
-    def _parse_main_mod(jar: zipfile.ZipFile, file_path: Path) -> ModInfo:
+    def _parse_main_mod(jar: zipfile.ZipFile, file_path: Path, names: Set[str]) -> ModInfo:
         """Parse the main mod from a JAR file"""
         # Try Forge/NeoForge (mods.toml)
-        if 'META-INF/mods.toml' in jar.namelist():
+        if 'META-INF/mods.toml' in names:
             return ModParser._parse_forge_neoforge(jar, file_path)
         
         # Try Fabric/Quilt (fabric.mod.json)
-        if 'fabric.mod.json' in jar.namelist():
+        if 'fabric.mod.json' in names:
             return ModParser._parse_fabric_quilt(jar, file_path)
         
         # Try old Forge (mcmod.info)
-        if 'mcmod.info' in jar.namelist():
+        if 'mcmod.info' in names:
             return ModParser._parse_old_forge(jar, file_path)
         
         # Try LiteLoader (litemod.json)
-        if 'litemod.json' in jar.namelist():
+        if 'litemod.json' in names:
             return ModParser._parse_liteloader(jar, file_path)
         
         return None
     
     @staticmethod
-    def _extract_jar_in_jar(jar: zipfile.ZipFile, parent_path: Path, parent_mod: ModInfo) -> List[ModInfo]:
+    def _extract_jar_in_jar(jar: zipfile.ZipFile, parent_path: Path, parent_mod: ModInfo, names: Set[str]) -> List[ModInfo]:
         """
         Extract and parse nested JAR files (Jar-in-Jar).
         Common locations:
@@ -410,7 +477,7 @@ class ModParser:
         
         # Look for nested JARs in common locations
         nested_jar_paths = []
-        for name in jar.namelist():
+        for name in names:
             if name.endswith('.jar') and (
                 name.startswith('META-INF/jarjar/') or
                 name.startswith('META-INF/jars/') or
@@ -421,54 +488,64 @@ class ModParser:
         if not nested_jar_paths:
             return nested_mods
         
-        # Create temp directory for extraction
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            for nested_jar_path in nested_jar_paths:
-                try:
-                    # Extract nested JAR
-                    jar.extract(nested_jar_path, temp_path)
-                    extracted_path = temp_path / nested_jar_path
-                    
-                    # Parse the nested JAR (don't recursively extract more JARs)
-                    nested_jar_mods = ModParser.parse_mod_file(extracted_path, extract_nested=False)
+        for nested_jar_path in sorted(nested_jar_paths):
+            try:
+                # Parse the nested JAR in memory (don't recursively extract more JARs)
+                with zipfile.ZipFile(io.BytesIO(jar.read(nested_jar_path))) as nested_jar:
+                    nested_jar_mods = ModParser._parse_open_zip(
+                        nested_jar, parent_path / nested_jar_path, extract_nested=False)
+                
+                for nested_mod in nested_jar_mods:
+                    nested_mod.is_jar_in_jar = True
+                    nested_mod.parent_mod = parent_name
+                    nested_mod.file_path = parent_path  # Reference parent file
+                    nested_mods.append(nested_mod)
                     
-                    for nested_mod in nested_jar_mods:
-                        nested_mod.is_jar_in_jar = True
-                        nested_mod.parent_mod = parent_name
-                        nested_mod.file_path = parent_path  # Reference parent file
-                        nested_mods.append(nested_mod)
-                        
-                except Exception as e:
-                    print(f"Warning: Failed to parse nested JAR {nested_jar_path}: {e}")
+            except Exception as e:
+                print(f"Warning: Failed to parse nested JAR {nested_jar_path}: {e}")
         
         return nested_mods
     
     @staticmethod
-    def _resolve_placeholder(value: str, jar: zipfile.ZipFile, file_path: Path) -> str:
+    def _read_placeholders(jar: zipfile.ZipFile, file_path: Path) -> Dict[str, str]:
+        """
+        Read the values of placeholders like ${file.jarVersion} once per jar.
+        """
+        placeholders = {}
+        
+        # ${file.jarVersion} - extract from jar manifest
+        try:
+            match = _IMPL_VERSION_RE.search(jar.read('META-INF/MANIFEST.MF'))
+            if match:
+                placeholders['${file.jarVersion}'] = match.group(1).decode('utf-8')
+        except:
+            pass
+        
+        # Fallback: try to extract from filename
+        if '${file.jarVersion}' not in placeholders:
+            match = _JAR_VERSION_RE.search(file_path.name)
+            if match:
+                placeholders['${file.jarVersion}'] = match.group(1)
+        
+        return placeholders
+    
+    @staticmethod
+    def _lazy_placeholders(jar: zipfile.ZipFile, file_path: Path) -> Callable[[], Dict[str, str]]:
+        """
+        Memoized _read_placeholders, the manifest is only read once a value needs it.
+        """
+        return cache(lambda: ModParser._read_placeholders(jar, file_path))
+    
+    @staticmethod
+    def _resolve_placeholder(value: str, placeholders: Callable[[], Dict[str, str]]) -> str:
         """
         Resolve placeholders like ${file.jarVersion} in metadata.
         """
         if not value or '${' not in value:
             return value
         
-        # ${file.jarVersion} - extract from jar manifest
-        if '${file.jarVersion}' in value:
-            try:
-                manifest = jar.read('META-INF/MANIFEST.MF').decode('utf-8')
-                for line in manifest.split('\n'):
-                    if line.startswith('Implementation-Version:'):
-                        version = line.split(':', 1)[1].strip()
-                        value = value.replace('${file.jarVersion}', version)
-                        return value
-            except:
-                pass
-            
-            # Fallback: try to extract from filename
-            match = re.search(r'[-_](\d+(?:\.\d+)*(?:[-+].+?)?)\.jar$', file_path.name)
-            if match:
-                value = value.replace('${file.jarVersion}', match.group(1))
+        for placeholder, replacement in placeholders().items():
+            value = value.replace(placeholder, replacement)
         
         return value
     
@@ -476,7 +553,8 @@ class ModParser:
     def _parse_forge_neoforge(jar: zipfile.ZipFile, file_path: Path) -> ModInfo:
         """Parse Forge/NeoForge mods.toml"""
         content = jar.read('META-INF/mods.toml').decode('utf-8')
-        data = toml.loads(content)
+        data = tomllib.loads(content)
+        placeholders = ModParser._lazy_placeholders(jar, file_path)
         
         # Determine if it's NeoForge or Forge
         loader_str = data.get('loaderVersion', '')
@@ -490,16 +568,16 @@ class ModParser:
         mod = mods[0]
         mod_id = mod.get('modId', 'unknown')
         name = mod.get('displayName', mod_id)
-        version = ModParser._resolve_placeholder(mod.get('version', '0.0.0'), jar, file_path)
+        version = ModParser._resolve_placeholder(mod.get('version', '0.0.0'), placeholders)
         
         # Parse dependencies
         dependencies = []
         for dep in data.get('dependencies', {}).get(mod_id, []):
             dep_mod_id = dep.get('modId', '')
-            is_special = dep_mod_id.lower() in SPECIAL_MODS
-            version_range = ModParser._resolve_placeholder(dep.get('versionRange', '*'), jar, file_path)
+            is_special = _is_special(dep_mod_id)
+            version_range = ModParser._resolve_placeholder(dep.get('versionRange', '*'), placeholders)
             
-            dependencies.append(Dependency(
+            dependencies.append(_intern_dep(
                 mod_id=dep_mod_id,
                 version_range=version_range,
                 mandatory=dep.get('mandatory', True),
@@ -519,12 +597,12 @@ class ModParser:
     @staticmethod
     def _parse_fabric_quilt(jar: zipfile.ZipFile, file_path: Path) -> ModInfo:
         """Parse Fabric/Quilt fabric.mod.json"""
-        content = jar.read('fabric.mod.json').decode('utf-8')
-        data = json.loads(content)
+        data = _json_loads(jar.read('fabric.mod.json'))
+        placeholders = ModParser._lazy_placeholders(jar, file_path)
         
         mod_id = data.get('id', 'unknown')
         name = data.get('name', mod_id)
-        version = ModParser._resolve_placeholder(data.get('version', '0.0.0'), jar, file_path)
+        version = ModParser._resolve_placeholder(data.get('version', '0.0.0'), placeholders)
         
         # Check if it's Quilt (has quilt_loader in depends)
         depends = data.get('depends', {})
@@ -533,8 +611,8 @@ class ModParser:
         # Parse dependencies
         dependencies = []
         for dep_id, dep_version in depends.items():
-            is_special = dep_id.lower() in SPECIAL_MODS
-            dependencies.append(Dependency(
+            is_special = _is_special(dep_id)
+            dependencies.append(_intern_dep(
                 mod_id=dep_id,
                 version_range=dep_version if isinstance(dep_version, str) else '*',
                 mandatory=True,
@@ -557,21 +635,21 @@ class ModParser:
     @staticmethod
     def _parse_old_forge(jar: zipfile.ZipFile, file_path: Path) -> ModInfo:
         """Parse old Forge mcmod.info"""
-        content = jar.read('mcmod.info').decode('utf-8')
-        data = json.loads(content)
+        data = _json_loads(jar.read('mcmod.info'))
+        placeholders = ModParser._lazy_placeholders(jar, file_path)
         
         if isinstance(data, list):
             data = data[0]
         
         mod_id = data.get('modid', 'unknown')
         name = data.get('name', mod_id)
-        version = ModParser._resolve_placeholder(data.get('version', '0.0.0'), jar, file_path)
+        version = ModParser._resolve_placeholder(data.get('version', '0.0.0'), placeholders)
         
         # Parse dependencies
         dependencies = []
         for dep in data.get('requiredMods', []):
-            is_special = dep.lower() in SPECIAL_MODS
-            dependencies.append(Dependency(
+            is_special = _is_special(dep)
+            dependencies.append(_intern_dep(
                 mod_id=dep,
                 mandatory=True,
                 is_special=is_special
@@ -589,18 +667,18 @@ class ModParser:
     @staticmethod
     def _parse_liteloader(jar: zipfile.ZipFile, file_path: Path) -> ModInfo:
         """Parse LiteLoader litemod.json"""
-        content = jar.read('litemod.json').decode('utf-8')
-        data = json.loads(content)
+        data = _json_loads(jar.read('litemod.json'))
+        placeholders = ModParser._lazy_placeholders(jar, file_path)
         
         mod_id = data.get('name', 'unknown')
         name = data.get('displayName', mod_id)
-        version = ModParser._resolve_placeholder(data.get('version', '0.0.0'), jar, file_path)
+        version = ModParser._resolve_placeholder(data.get('version', '0.0.0'), placeholders)
         
         # LiteLoader doesn't typically have complex dependency definitions
         dependencies = []
         for dep in data.get('requiredMods', []):
-            is_special = dep.lower() in SPECIAL_MODS
-            dependencies.append(Dependency(
+            is_special = _is_special(dep)
+            dependencies.append(_intern_dep(
                 mod_id=dep,
                 mandatory=True,
                 is_special=is_special
@@ -622,7 +700,7 @@ class DependencyChecker:
     def __init__(self, mods: List[ModInfo]):
         self.mods = mods
         self.mod_map: Dict[str, ModInfo] = {}
-        self.special_requirements: Dict[str, List[Tuple[str, str]]] = {}  # special_mod_id -> [(mod_name, version_range)]
+        self.special_requirements: Dict[str, Dict[str, List[str]]] = {}  # special_mod_id -> version_range -> [mod_name]
         self._build_mod_map()
         self._collect_special_requirements()
     
@@ -639,49 +717,53 @@ class DependencyChecker:
         for mod in self.mods:
             for dep in mod.dependencies:
                 if dep.is_special and dep.mandatory:
-                    if dep.mod_id not in self.special_requirements:
-                        self.special_requirements[dep.mod_id] = []
-                    self.special_requirements[dep.mod_id].append((mod.name, dep.version_range))
+                    self.special_requirements.setdefault(dep.mod_id, {}).setdefault(dep.version_range, []).append(mod.name)
     
-    def check_dependencies(self) -> Tuple[bool, List[str]]:
+    def check_dependencies(self, include_success: bool = True) -> Tuple[bool, List[str]]:
         """
         Check if all dependencies are satisfied.
         Returns (all_satisfied, list_of_issues)
+        Lines for satisfied dependencies are only built if include_success is set.
         """
         issues = []
         all_satisfied = True
         
+        mod_map = self.mod_map
+        issues_append = issues.append
+        
         for mod in self.mods:
             for dep in mod.dependencies:
                 if dep.is_special or not dep.mandatory:
                     continue  # Skip special mods and optional deps
                 
-                if dep.mod_id not in self.mod_map:
+                dep_mod_id = dep.mod_id
+                dep_range = dep.version_range
+                dep_mod = mod_map.get(dep_mod_id)
+                if dep_mod is None:
                     all_satisfied = False
-                    issues.append(
-                        f"❌ {mod.name} ({mod.mod_id}) requires {dep.mod_id} {dep.version_range} - NOT FOUND"
+                    issues_append(
+                        f"❌ {mod.name} ({mod.mod_id}) requires {dep_mod_id} {dep_range} - NOT FOUND"
                     )
                 else:
                     # Dependency found - check version
-                    dep_mod = self.mod_map[dep.mod_id]
-                    
                     try:
-                        version_range = VersionRange.parse(dep.version_range)
-                        dep_version = MavenVersion(dep_mod.version)
+                        version_range = _make_range(dep_range)
+                        dep_version = _make_version(dep_mod.version)
                         
                         if version_range.contains(dep_version):
-                            issues.append(
-                                f"✓ {mod.name} ({mod.mod_id}) requires {dep.mod_id} {dep.version_range} - found v{dep_mod.version}"
-                            )
+                            if include_success:
+                                issues_append(
+                                    f"✓ {mod.name} ({mod.mod_id}) requires {dep_mod_id} {dep_range} - found v{dep_mod.version}"
+                                )
                         else:
                             all_satisfied = False
-                            issues.append(
-                                f"❌ {mod.name} ({mod.mod_id}) requires {dep.mod_id} {dep.version_range} - found v{dep_mod.version} (INCOMPATIBLE)"
+                            issues_append(
+                                f"❌ {mod.name} ({mod.mod_id}) requires {dep_mod_id} {dep_range} - found v{dep_mod.version} (INCOMPATIBLE)"
                             )
                     except Exception as e:
                         # Fallback if version parsing fails
-                        issues.append(
-                            f"⚠️  {mod.name} ({mod.mod_id}) requires {dep.mod_id} {dep.version_range} - found v{dep_mod.version} (cannot verify)"
+                        issues_append(
+                            f"⚠️  {mod.name} ({mod.mod_id}) requires {dep_mod_id} {dep_range} - found v{dep_mod.version} (cannot verify)"
                         )
         
         return all_satisfied, issues
@@ -694,19 +776,13 @@ class DependencyChecker:
         summary = []
         
         for special_mod_id in sorted(self.special_requirements.keys()):
-            requirements = self.special_requirements[special_mod_id]
+            version_groups = self.special_requirements[special_mod_id]
             
             summary.append(f"\n{special_mod_id.upper()}:")
             
             # Compute intersection of all version ranges
             try:
-                combined_range = None
-                for mod_name, version_range_str in requirements:
-                    version_range = VersionRange.parse(version_range_str)
-                    if combined_range is None:
-                        combined_range = version_range
-                    else:
-                        combined_range = combined_range.intersect(version_range)
+                combined_range = reduce(VersionRange.intersect, map(_make_range, version_groups))
                 
                 if combined_range and not combined_range.is_empty():
                     summary.append(f"  Required version: {combined_range}")
@@ -715,12 +791,6 @@ class DependencyChecker:
                 
                 # Show individual requirements
                 summary.append(f"  Individual requirements:")
-                version_groups: Dict[str, List[str]] = {}
-                for mod_name, version_range in requirements:
-                    if version_range not in version_groups:
-                        version_groups[version_range] = []
-                    version_groups[version_range].append(mod_name)
-                
                 for version_range in sorted(version_groups.keys()):
                     mod_names = version_groups[version_range]
                     if len(mod_names) <= 3:
@@ -739,8 +809,9 @@ class DependencyChecker:
             except Exception as e:
                 summary.append(f"  ⚠️  Error computing version intersection: {e}")
                 # Fallback to simple listing
-                for mod_name, version_range in requirements:
-                    summary.append(f"    {version_range} - {mod_name}")
+                for version_range, mod_names in version_groups.items():
+                    for mod_name in mod_names:
+                        summary.append(f"    {version_range} - {mod_name}")
         
         return summary
     
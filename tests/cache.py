@@ -0,0 +1,161 @@
+"""
+Unit tests for the on-disk API response cache
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from typing import List, cast
+from unittest import mock
+from pydantic import BaseModel
+from src.lib.cache import CachedClient
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class FakeClient:
+    """Counts the calls that reach the 'network'"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_items(self, ids: List[int]) -> List[Item]:
+        self.calls += 1
+        return [Item(id=i, name=f"item{i}") for i in ids]
+
+    def get_count(self, n: int) -> int:
+        self.calls += 1
+        return n
+
+
+class TestCachedClient(unittest.TestCase):
+    """Test cases for CachedClient"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.client = FakeClient()
+        self.cached = CachedClient(self.client, "test", {"get_items": 100}, default_ttl=10,
+                                   cache_dir=self.tmp.name)
+
+    def entries(self) -> List[str]:
+        return [os.path.join(self.cached.cache_dir, name) for name in os.listdir(self.cached.cache_dir)]
+
+    def age(self, path: str, seconds: float):
+        then = time.time() - seconds
+        os.utime(path, (then, then))
+
+    def test_fresh_hit(self):
+        """A second call within the TTL is served from disk"""
+        self.assertEqual(self.cached.get_count(3), 3)
+        self.assertEqual(self.cached.get_count(3), 3)
+        self.assertEqual(self.client.calls, 1)
+
+    def test_arguments_in_key(self):
+        """Different arguments are cached separately"""
+        self.cached.get_count(1)
+        self.cached.get_count(2)
+        self.assertEqual(self.client.calls, 2)
+        self.assertEqual(len(self.entries()), 2)
+
+    def test_expired_refetch(self):
+        """An entry older than its TTL is fetched again"""
+        self.cached.get_count(3)
+        self.age(self.entries()[0], 11)
+        self.assertEqual(self.cached.get_count(3), 3)
+        self.assertEqual(self.client.calls, 2)
+
+    def test_per_method_ttl(self):
+        """Methods listed in ttl use their own TTL instead of the default one"""
+        self.cached.get_items([1])
+        self.age(self.entries()[0], 11)
+        self.cached.get_items([1])
+        self.assertEqual(self.client.calls, 1)
+
+    def test_pydantic_round_trip(self):
+        """Cached results are validated back into the annotated return type"""
+        fetched = cast(List[Item], self.cached.get_items([1, 2]))
+        cached = cast(List[Item], self.cached.get_items([1, 2]))
+        self.assertEqual(self.client.calls, 1)
+        self.assertTrue(all(isinstance(item, Item) for item in cached))
+        self.assertEqual(cached, fetched)
+
+    def test_corrupted_entry(self):
+        """An unreadable entry falls back to the client and is overwritten"""
+        self.cached.get_items([1])
+        with open(self.entries()[0], 'w') as f:
+            f.write('{"not": "a list"')
+        self.assertEqual(self.cached.get_items([1]), [Item(id=1, name="item1")])
+        self.assertEqual(self.client.calls, 2)
+        self.assertEqual(self.cached.get_items([1]), [Item(id=1, name="item1")])
+        self.assertEqual(self.client.calls, 2)
+
+    def test_prune_on_construction(self):
+        """Entries older than the longest TTL and leftover temporary files are removed"""
+        self.cached.get_count(1)
+        self.cached.get_count(2)
+        stale, fresh = self.entries()
+        leftover = os.path.join(self.cached.cache_dir, "leftover.tmp")
+        open(leftover, 'w').close()
+        self.age(stale, 101)
+        self.age(fresh, 50)
+        self.age(leftover, 101)
+        CachedClient(self.client, "test", {"get_items": 100}, default_ttl=10, cache_dir=self.tmp.name)
+        self.assertEqual(self.entries(), [fresh])
+
+    def test_namespaces_separated(self):
+        """Clients of different namespaces neither share nor prune each other's entries"""
+        other = CachedClient(self.client, "other", cache_dir=self.tmp.name)
+        self.cached.get_count(1)
+        other.get_count(1)
+        self.assertEqual(self.client.calls, 2)
+        self.assertNotEqual(self.cached.cache_dir, other.cache_dir)
+
+    def test_attributes_passed_through(self):
+        """Plain attributes of the client are not wrapped"""
+        self.assertIs(self.cached.client, self.client)
+        self.assertEqual(self.cached.calls, 0)
+
+
+class TestNoCache(unittest.TestCase):
+    """`--no-cache` leaves the API clients unwrapped"""
+
+    def setUp(self):
+        from src.lib.searcher import ModSearcher
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.dict(os.environ, {"XDG_CACHE_HOME": self.tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.ModSearcher = ModSearcher
+
+    def make(self, use_cache: bool):
+        searcher = self.ModSearcher("1.20.1", "fabric", "key", use_cache=use_cache)
+        self.addCleanup(searcher.close)
+        return searcher
+
+    def test_cache_enabled(self):
+        searcher = self.make(True)
+        self.assertIsInstance(searcher.mrcli, CachedClient)
+        self.assertIsInstance(searcher.cfcli, CachedClient)
+
+    def test_cache_disabled(self):
+        searcher = self.make(False)
+        self.assertNotIsInstance(searcher.mrcli, CachedClient)
+        self.assertNotIsInstance(searcher.cfcli, CachedClient)
+
+    def test_download_flag(self):
+        import argparse
+        from src.mcmodmanager.download import addparser
+        parser = argparse.ArgumentParser()
+        addparser(parser.add_subparsers())
+        self.assertTrue(parser.parse_args(["download", "--no-cache", "sodium"]).no_cache)
+        self.assertFalse(parser.parse_args(["download", "sodium"]).no_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Unit tests for the version comparison of the health2 dependency checker
+"""
+
+import unittest
+from src.mcmodmanager.health2 import MavenVersion, VersionRange
+
+
+class TestMavenVersionKey(unittest.TestCase):
+    """Test cases for the precomputed comparison key of MavenVersion"""
+
+    def test_qualifiers_case_insensitive(self):
+        """Qualifiers and their aliases compare equal regardless of case"""
+        self.assertEqual(MavenVersion("1.0-ALPHA"), MavenVersion("1.0-alpha"))
+        self.assertEqual(MavenVersion("1.0-alpha"), MavenVersion("1.0-a"))
+        self.assertEqual(MavenVersion("1.0-RC"), MavenVersion("1.0-cr"))
+        self.assertEqual(MavenVersion("1.0-Snapshot"), MavenVersion("1.0-SNAPSHOT"))
+        self.assertEqual(hash(MavenVersion("1.0-BETA")), hash(MavenVersion("1.0-b")))
+
+    def test_qualifier_order(self):
+        """alpha < beta < milestone < rc < snapshot < release"""
+        versions = ["1.0-alpha", "1.0-BETA", "1.0-m", "1.0-rc", "1.0-SNAPSHOT", "1.0"]
+        for lower, higher in zip(versions, versions[1:]):
+            self.assertLess(MavenVersion(lower), MavenVersion(higher), f"{lower} < {higher}")
+
+    def test_trailing_zeros(self):
+        """1 == 1.0 == 1.0.0, with equal hashes"""
+        v1, v10, v100 = MavenVersion("1"), MavenVersion("1.0"), MavenVersion("1.0.0")
+        self.assertEqual(v1, v10)
+        self.assertEqual(v10, v100)
+        self.assertEqual(hash(v1), hash(v10))
+        self.assertEqual(hash(v10), hash(v100))
+        self.assertEqual(len({v1, v10, v100}), 1)
+        self.assertFalse(v1 < v10 or v10 < v1)
+
+    def test_numeric_ordering(self):
+        """Purely numeric versions compare segment by segment, without padding"""
+        self.assertLess(MavenVersion("1.9"), MavenVersion("1.10"))
+        self.assertLess(MavenVersion("1.20"), MavenVersion("1.20.1"))
+        self.assertLess(MavenVersion("1.20.1"), MavenVersion("1.21"))
+        self.assertGreater(MavenVersion("2"), MavenVersion("1.99.99"))
+
+    def test_numeric_prefix_segment(self):
+        """A segment with a numeric prefix sorts right after that number"""
+        build = MavenVersion("1.0+build")
+        self.assertGreater(build, MavenVersion("1.0"))
+        self.assertLess(build, MavenVersion("1.1"))
+        self.assertLess(MavenVersion("1.0+a"), MavenVersion("1.0+b"))
+
+    def test_string_segment_after_numbers(self):
+        """Other strings sort after every number, including ones starting below '0'"""
+        self.assertGreater(MavenVersion("1.x"), MavenVersion("1.9"))
+        self.assertGreater(MavenVersion("1.+"), MavenVersion("1.9"))
+        self.assertLess(MavenVersion("1.x"), MavenVersion("2"))
+        self.assertLess(MavenVersion("5.aardvark"), MavenVersion("5.Zebra"))
+
+    def test_qualifier_before_string(self):
+        """Known qualifiers sort before numbers, unknown strings after them"""
+        self.assertLess(MavenVersion("1.0-rc"), MavenVersion("1.0"))
+        self.assertGreater(MavenVersion("1.0-custom"), MavenVersion("1.0"))
+
+
+class TestVersionRangeAny(unittest.TestCase):
+    """Test cases for the '*' range"""
+
+    def test_star_is_unbounded(self):
+        self.assertEqual(VersionRange.parse("*").intervals, [(None, True, None, False)])
+        self.assertEqual(VersionRange.parse(" * ").intervals, [(None, True, None, False)])
+
+    def test_star_contains_everything(self):
+        star = VersionRange.parse("*")
+        for version in ("0", "1.0-alpha", "1.20.1", "1.0+build", "x", "99999"):
+            self.assertTrue(star.contains(MavenVersion(version)), version)
+
+    def test_star_intersection(self):
+        """Intersecting with '*' keeps the other range"""
+        other = VersionRange([(MavenVersion("1.0"), True, MavenVersion("2.0"), False)])
+        both = VersionRange.parse("*").intersect(other)
+        self.assertTrue(both.contains(MavenVersion("1.5")))
+        self.assertFalse(both.contains(MavenVersion("2.0")))
+        self.assertFalse(both.contains(MavenVersion("0.9")))
+
+
+if __name__ == "__main__":
+    unittest.main()
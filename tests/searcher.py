@@ -0,0 +1,56 @@
+"""
+Unit tests for the connection pool shared by ModSearcher instances
+"""
+
+import unittest
+import curseforge_api_wrapper.network as cfnet
+import modrinth_api_wrapper.network as mrnet
+from src.lib.searcher import ModSearcher
+
+
+class TestSharedSession(unittest.TestCase):
+    """The wrappers' module level clients are replaced once and restored on close()"""
+
+    def setUp(self):
+        self.original = (mrnet.CLIENT, cfnet.CLIENT)
+
+    def make(self) -> ModSearcher:
+        searcher = ModSearcher("1.20.1", "fabric", None, use_cache=False)
+        self.addCleanup(searcher.close)
+        return searcher
+
+    def test_install_and_restore(self):
+        searcher = self.make()
+        self.assertIs(mrnet.CLIENT, searcher.session)
+        self.assertIs(cfnet.CLIENT, searcher.session)
+        searcher.close()
+        self.assertEqual((mrnet.CLIENT, cfnet.CLIENT), self.original)
+
+    def test_nested_searchers(self):
+        """A second searcher reuses the installed pool and does not restore anything"""
+        outer = self.make()
+        inner = self.make()
+        self.assertIsNone(inner.session)
+        inner.close()
+        self.assertIs(mrnet.CLIENT, outer.session)
+        outer.close()
+        self.assertEqual((mrnet.CLIENT, cfnet.CLIENT), self.original)
+
+    def test_out_of_order_close(self):
+        """Closing the owner first restores the original clients, not a closed pool"""
+        outer = self.make()
+        inner = self.make()
+        outer.close()
+        inner.close()
+        self.assertEqual((mrnet.CLIENT, cfnet.CLIENT), self.original)
+        self.assertFalse(mrnet.CLIENT.is_closed)
+
+    def test_close_twice(self):
+        searcher = self.make()
+        searcher.close()
+        searcher.close()
+        self.assertEqual((mrnet.CLIENT, cfnet.CLIENT), self.original)
+
+
+if __name__ == "__main__":
+    unittest.main()
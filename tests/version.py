@@ -317,6 +317,15 @@ class TestVersionRange(unittest.TestCase):
         self.assertTrue(vr.contains("1.5"))
         self.assertFalse(vr.contains("2.0"))
 
+    def test_range_intersection(self):
+        """Test intersection of hard requirements"""
+        vr = VersionRange("[1.20,1.20.2)") & VersionRange("[1.19,1.20.1]")
+        self.assertEqual(str(vr), "[1.20,1.20.1]")
+        self.assertFalse(vr.contains("1.19"))
+        self.assertTrue(vr.contains("1.20.1"))
+        self.assertFalse(vr.contains("1.20.2"))
+        self.assertFalse(VersionRange("[1.0,2.0)") & VersionRange("[3.0,4.0)"))
+
 
 class TestVersionSegment(unittest.TestCase):
     """Test cases for VersionSegment class"""